@@ -5,7 +5,187 @@ Uses BeautifulSoup4 for extraction and Mistral API for intelligent summarization
 
 import json
 import os
+import re
 import base64
+import concurrent.futures
+import gzip
+import hashlib
+import socket
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+
+# orjson serializes/deserializes several times faster than stdlib json;
+# fall back if the wheel isn't in the deployment package
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+_WS = re.compile(r'\s+')
+
+# A "meaningful" sentence for the simple summary: 50+ chars ending in a period
+_SENT = re.compile(r'[^.]{50,}\.')
+
+# Stop downloading once this much HTML is buffered; the article body is
+# almost always within the first 256 KB and we only keep 5000 chars anyway
+_MAX_FETCH_BYTES = 262144
+
+# Extracted article text is cached on /tmp, which survives warm invocations;
+# a hit skips both the HTTPS fetch and the parse
+_TMP_CACHE_DIR = '/tmp/article_cache'
+_TMP_CACHE_TTL = 86400  # seconds
+_TMP_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# One CSS selector covering the whole candidate chain: soupsieve walks the
+# tree once and short-circuits on the first match
+_CONTENT_SELECTOR = 'article, main, .content, #content, .article-body, .post-content'
+
+# Only parse the tags extraction actually inspects; lxml skips the rest
+_CONTENT_STRAINER = SoupStrainer(
+    ['article', 'main', 'p', 'div', 'script', 'style', 'nav', 'footer', 'header']
+)
+
+# Reuse one session across warm invocations so repeat fetches keep the
+# TCP+TLS connection alive instead of renegotiating per request
+_session = requests.Session()
+_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+_session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=1, backoff_factor=0.1)
+))
+
+# Build the DynamoDB table handle once at container init so botocore's
+# connection pool is reused across warm invocations (Table() lazily calls
+# DescribeTable, so per-invocation construction also costs a round trip)
+_table = None
+try:
+    import boto3
+    from botocore.config import Config
+
+    _table = boto3.resource('dynamodb', config=Config(
+        max_pool_connections=10,
+        retries={'max_attempts': 2, 'mode': 'adaptive'},
+        connect_timeout=1,
+        read_timeout=2,
+    )).Table('news-summary-cache')
+except Exception as e:
+    print(f"Could not initialize DynamoDB table: {e}")
+
+# Small pool for overlapping cache I/O with the article fetch and for
+# getting the cache write off the response's critical path
+_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+# In-process cache in front of DynamoDB: repeat requests for the same URL
+# on a warm container skip the network round trip entirely
+_local_cache = {}
+_LOCAL_CACHE_MAX = 128
+
+# How long cached summaries stay valid; the DynamoDB table should have TTL
+# enabled on the ttl attribute so expired entries are deleted server-side
+_CACHE_TTL = 86400  # seconds
+
+# Summarization prompt pieces, built once; per call we only concatenate
+_PROMPT_PREFIX = """Please provide a comprehensive summary of the following article.
+Include:
+1. A 3-4 sentence summary of the main points
+2. 3-5 key takeaways as bullet points
+
+Article URL: """
+_PROMPT_MID = """
+
+Article Text:
+"""
+_PROMPT_SUFFIX = """
+
+Format your response as:
+Summary: [Your summary here]
+
+Key Points:
+• [Point 1]
+• [Point 2]
+• [Point 3]
+"""
+
+# Cap article text sent to the model (avoids token limits; shorter prompts
+# also bill and stream faster)
+_PROMPT_TEXT_CAP = 3000
+
+# Build the Mistral client once at container init so its underlying httpx
+# connection pool is reused across warm invocations
+_mistral_client = None
+if os.environ.get('MISTRAL_API_KEY'):
+    try:
+        from mistralai import Mistral
+        _mistral_client = Mistral(api_key=os.environ.get('MISTRAL_API_KEY'))
+        # Pre-resolve the API host during INIT so the first invocation
+        # doesn't pay the DNS lookup
+        socket.getaddrinfo('api.mistral.ai', 443)
+    except Exception as e:
+        print(f"Could not initialize Mistral client: {e}")
+
+_DEBUG = bool(os.environ.get('DEBUG'))
+
+
+def _url_from_query_string(event):
+    """Pull the url parameter out of a raw query string, if present"""
+    query_string = event.get('rawQueryString')
+    if not query_string:
+        return None
+    params = urllib.parse.parse_qs(query_string)
+    return params['url'][0] if 'url' in params else None
+
+
+def _url_from_body(event):
+    """Pull the url field out of the (possibly base64-encoded) JSON body"""
+    body_content = event.get('body')
+    if not body_content:
+        return None
+    try:
+        if event.get('isBase64Encoded', False):
+            body_content = base64.b64decode(body_content)
+        if isinstance(body_content, (str, bytes)):
+            body_content = _json_loads(body_content)
+        return body_content.get('url')
+    except Exception as e:
+        if _DEBUG:
+            print(f"Error parsing body: {e}")
+        return None
+
+
+def _response(event, status_code, payload):
+    """Build the handler response, gzipping the body when the client accepts it"""
+    body = _json_dumps(payload)
+    headers = {'Content-Type': 'application/json'}
+
+    accept_encoding = (event.get('headers') or {}).get('accept-encoding', '')
+    if 'gzip' in accept_encoding.lower():
+        # Level 1 is nearly as small as the default on JSON text at a
+        # fraction of the CPU
+        compressed = gzip.compress(body.encode('utf-8'), compresslevel=1)
+        headers['Content-Encoding'] = 'gzip'
+        return {
+            'statusCode': status_code,
+            'headers': headers,
+            'isBase64Encoded': True,
+            'body': base64.b64encode(compressed).decode()
+        }
+
+    return {'statusCode': status_code, 'headers': headers, 'body': body}
+
 
 def lambda_handler(event, context):
     """
@@ -13,166 +193,167 @@ def lambda_handler(event, context):
     Accepts POST request with URL and returns AI-generated summary
     """
     try:
-        # Debug: Log the entire event structure
-        print(f"Event keys: {list(event.keys())}")
-        print(f"Full event: {json.dumps(event)}")
-        
-        # Initialize url as None
-        url = None
-        
-        # First, check query parameters (most reliable for Lambda Function URLs)
-        if 'queryStringParameters' in event and event['queryStringParameters']:
-            url = event['queryStringParameters'].get('url')
-            if url:
-                print(f"URL found in query parameters: {url}")
-        
-        # If not in query params, check raw query string
-        if not url and 'rawQueryString' in event:
-            query_string = event['rawQueryString']
-            print(f"Raw query string: {query_string}")
-            # Parse the query string
-            if query_string:
-                import urllib.parse
-                params = urllib.parse.parse_qs(query_string)
-                if 'url' in params:
-                    url = params['url'][0]
-                    print(f"URL extracted from raw query string: {url}")
-        
-        # Check if body exists and handle it
-        if not url and 'body' in event:
-            body_content = event['body']
-            print(f"Body found: {body_content}")
-            
-            # Check if body is base64 encoded
-            if event.get('isBase64Encoded', False):
-                body_content = base64.b64decode(body_content).decode('utf-8')
-                print(f"Decoded body: {body_content}")
-            
-            # Parse the body
-            try:
-                if isinstance(body_content, str):
-                    body = json.loads(body_content)
-                else:
-                    body = body_content
-                url = body.get('url')
-                print(f"Extracted URL from body: {url}")
-            except Exception as e:
-                print(f"Error parsing body: {e}")
-        
-        # If still no URL, check if it's directly in the event
-        if not url and 'url' in event:
-            url = event['url']
-            print(f"URL found directly in event: {url}")
-            
+        if _DEBUG:
+            print(f"Event keys: {list(event.keys())}")
+
+        # Query parameters, then raw query string, then body, then the
+        # event itself (direct invocation)
+        url = ((event.get('queryStringParameters') or {}).get('url')
+               or _url_from_query_string(event)
+               or _url_from_body(event)
+               or event.get('url'))
+
         # Check if URL was found
         if not url:
             # Return more detailed error for debugging
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'error': 'URL is required. Please check if the request body is being sent correctly.',
-                    'debug': {
-                        'event_keys': list(event.keys()),
-                        'has_body': 'body' in event,
-                        'headers': event.get('headers', {}).get('content-type', 'not found')
-                    }
-                })
-            }
-        
+            return _response(event, 400, {
+                'error': 'URL is required. Please check if the request body is being sent correctly.',
+                'debug': {
+                    'event_keys': list(event.keys()),
+                    'has_body': 'body' in event,
+                    'headers': event.get('headers', {}).get('content-type', 'not found')
+                }
+            })
+
+        # Kick off the article fetch while the cache lookup is in flight;
+        # on a hit the fetch is cancelled (or its result discarded)
+        fetch_future = _pool.submit(extract_article_text, url)
+        cached = check_cache(url)
+        if cached:
+            fetch_future.cancel()
+            return _response(event, 200, {
+                'url': url,
+                'summary': cached,
+                'word_count': len(cached.split()),
+                'from_cache': True
+            })
+
         # Extract article text
-        article_text = extract_article_text(url)
-        
+        article_text = fetch_future.result()
+
         if not article_text:
-            return {
-                'statusCode': 400,
-                'body': json.dumps({'error': 'Could not extract text from article'})
-            }
-        
+            return _response(event, 400, {'error': 'Could not extract text from article'})
+
         # Get summary using Mistral API if available, otherwise use simple method
-        if os.environ.get('MISTRAL_API_KEY'):
+        if _mistral_client:
             summary = get_mistral_summary(article_text, url)
         else:
             summary = get_simple_summary(article_text)
         
         if not summary:
-            return {
-                'statusCode': 400,
-                'body': json.dumps({'error': 'Could not generate summary'})
-            }
-        
+            return _response(event, 400, {'error': 'Could not generate summary'})
+
+        # Cache for next time: write in the background so the response isn't
+        # blocked on DynamoDB, with a short head start before the container
+        # may be frozen after return (a lost write only costs a cache miss)
+        save_future = _pool.submit(save_to_cache, url, summary)
+        concurrent.futures.wait([save_future], timeout=0.02)
+
         # Return summary
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'url': url,
-                'summary': summary,
-                'word_count': len(summary.split()),
-                'from_cache': False
-            })
-        }
-        
+        return _response(event, 200, {
+            'url': url,
+            'summary': summary,
+            'word_count': len(summary.split()),
+            'from_cache': False
+        })
+
     except Exception as e:
         print(f"Error in handler: {str(e)}")
         import traceback
         print(f"Traceback: {traceback.format_exc()}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
-        }
+        return _response(event, 500, {'error': str(e)})
+
+
+def _tmp_cache_path(url):
+    key = hashlib.sha1(url.encode(), usedforsecurity=False).hexdigest()
+    return os.path.join(_TMP_CACHE_DIR, f'{key}.txt')
+
+
+def _tmp_cache_get(url):
+    """Return cached article text from /tmp, or None if missing/stale"""
+    try:
+        path = _tmp_cache_path(url)
+        if os.path.exists(path) and (time.time() - os.path.getmtime(path)) < _TMP_CACHE_TTL:
+            with open(path) as f:
+                return f.read()
+    except OSError:
+        pass
+    return None
+
+
+def _tmp_cache_put(url, article_text):
+    """Write article text to /tmp, evicting oldest files past the size cap"""
+    try:
+        os.makedirs(_TMP_CACHE_DIR, exist_ok=True)
+        with open(_tmp_cache_path(url), 'w') as f:
+            f.write(article_text)
+
+        # Evict oldest-first if the cache directory outgrows its budget
+        entries = []
+        for name in os.listdir(_TMP_CACHE_DIR):
+            path = os.path.join(_TMP_CACHE_DIR, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        if total > _TMP_CACHE_MAX_BYTES:
+            for _, size, path in sorted(entries):
+                os.remove(path)
+                total -= size
+                if total <= _TMP_CACHE_MAX_BYTES:
+                    break
+    except OSError as e:
+        print(f"/tmp cache write error: {e}")
 
 
 def extract_article_text(url):
     """Extract text from webpage using BeautifulSoup4"""
+    cached = _tmp_cache_get(url)
+    if cached:
+        return cached
+
     try:
-        import requests
-        from bs4 import BeautifulSoup
-        
-        # Fetch webpage
-        response = requests.get(url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Fetch webpage (separate connect/read timeouts so slow hosts fail fast),
+        # streaming so we can stop once we have enough HTML instead of
+        # downloading megabytes of ads and trackers we'd throw away
+        response = _session.get(url, stream=True, timeout=(3.05, 10))
         response.raise_for_status()
-        
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
+
+        buf = bytearray()
+        for chunk in response.iter_content(chunk_size=16384):
+            buf.extend(chunk)
+            if len(buf) >= _MAX_FETCH_BYTES:
+                break
+        response.close()
+
+        # Parse HTML with BeautifulSoup (lxml is C-based and much faster than
+        # html.parser; bytes input lets lxml handle encoding detection itself)
+        soup = BeautifulSoup(bytes(buf), 'lxml', parse_only=_CONTENT_STRAINER)
         
         # Try to find article content
         article_text = ""
-        
-        # Look for article tag first
-        article = soup.find('article')
-        if article:
-            article_text = article.get_text()
-        
-        # If no article tag, look for main content
-        if not article_text:
-            main = soup.find('main')
-            if main:
-                article_text = main.get_text()
-        
-        # If still no content, look for common content divs
-        if not article_text:
-            for selector in ['.content', '#content', '.article-body', '.post-content']:
-                content = soup.select_one(selector)
-                if content:
-                    article_text = content.get_text()
-                    break
-        
-        # Fallback to all paragraph tags
+
+        # Find the content node with a single traversal over all candidates
+        node = soup.select_one(_CONTENT_SELECTOR)
+        if node:
+            # Strip boilerplate only inside the subtree we keep — an
+            # O(subtree) walk instead of O(document)
+            for tag in node.select('script, style, nav, footer, header'):
+                tag.decompose()
+            article_text = node.get_text(separator=' ', strip=True)
+
+        # Fallback: one whole-document walk instead of joining per-paragraph
         if not article_text:
-            paragraphs = soup.find_all('p')
-            article_text = ' '.join([p.get_text() for p in paragraphs])
-        
-        # Clean up text
-        lines = (line.strip() for line in article_text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        article_text = ' '.join(chunk for chunk in chunks if chunk)
+            for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
+                tag.decompose()
+            article_text = soup.get_text(separator=' ', strip=True)
         
-        return article_text[:5000]  # Limit to 5000 chars
+        # Collapse all runs of whitespace in one regex pass
+        article_text = _WS.sub(' ', article_text).strip()[:5000]  # Limit to 5000 chars
+
+        if article_text:
+            _tmp_cache_put(url, article_text)
+
+        return article_text
         
     except Exception as e:
         print(f"Error extracting text: {e}")
@@ -182,40 +363,36 @@ def extract_article_text(url):
 def get_mistral_summary(article_text, url):
     """Use Mistral API to generate intelligent summary"""
     try:
-        from mistralai import Mistral
-        
-        # Initialize Mistral client
-        client = Mistral(api_key=os.environ.get('MISTRAL_API_KEY'))
-        
-        # Create prompt for summarization
-        prompt = f"""Please provide a comprehensive summary of the following article.
-        Include:
-        1. A 3-4 sentence summary of the main points
-        2. 3-5 key takeaways as bullet points
-        
-        Article URL: {url}
-        
-        Article Text:
-        {article_text[:3000]}  # Limit text to avoid token limits
-        
-        Format your response as:
-        Summary: [Your summary here]
-        
-        Key Points:
-        • [Point 1]
-        • [Point 2]
-        • [Point 3]
-        """
-        
-        # Get response from Mistral
-        response = client.chat.complete(
+        # Create prompt for summarization; truncate on a word boundary so
+        # the model never sees a chopped final word
+        text = article_text
+        if len(text) > _PROMPT_TEXT_CAP:
+            text = text[:_PROMPT_TEXT_CAP].rsplit(' ', 1)[0]
+        prompt = _PROMPT_PREFIX + url + _PROMPT_MID + text + _PROMPT_SUFFIX
+
+        # Stream the response so we start consuming tokens as they arrive
+        # instead of idling on the socket for the full completion; cut off
+        # at a wall-clock budget so a slow completion can't run into the
+        # gateway's 30 s cap. In mistralai 1.0.0 chat.stream returns a plain
+        # generator (or None), not a context manager.
+        deadline = time.monotonic() + 20
+        stream = _mistral_client.chat.stream(
             model="mistral-small-latest",
             messages=[
                 {"role": "user", "content": prompt}
             ]
         )
-        
-        return response.choices[0].message.content
+        if stream is None:
+            return get_simple_summary(article_text)
+
+        parts = []
+        for chunk in stream:
+            parts.append(chunk.data.choices[0].delta.content or '')
+            if time.monotonic() > deadline:
+                stream.close()
+                break
+
+        return ''.join(parts)
         
     except Exception as e:
         print(f"Mistral API error: {e}") 
@@ -226,18 +403,17 @@ def get_mistral_summary(article_text, url):
 def get_simple_summary(article_text):
     """Simple text summarization without AI (fallback)"""
     try:
-        # Take first 3-4 sentences
+        # Take the first 3-4 meaningful sentences, scanning lazily and only
+        # the first 2000 chars (4 kept sentences can never start past that)
         sentences = []
-        for sentence in article_text.split('.'):
-            cleaned = sentence.strip()
-            if len(cleaned) > 50:  # Only meaningful sentences
-                sentences.append(cleaned)
+        for match in _SENT.finditer(article_text[:2000]):
+            sentences.append(match.group().strip().rstrip('.'))
             if len(sentences) >= 4:
                 break
-        
+
         if not sentences:
             return "Could not extract meaningful content from the article."
-        
+
         summary = '. '.join(sentences) + '.'
         
         # Limit length
@@ -250,14 +426,85 @@ def get_simple_summary(article_text):
         return f"Error creating summary: {str(e)}"
 
 
+def _url_key(url):
+    """Cache key for a URL. SHA-256 takes the hardware (SHA-NI/ARMv8) fast
+    path that MD5 lacks; usedforsecurity=False keeps it usable under FIPS."""
+    return hashlib.sha256(url.encode('utf-8'), usedforsecurity=False).digest()[:16].hex()
+
+
+def _local_cache_put(url_key, summary, expires_at):
+    if len(_local_cache) >= _LOCAL_CACHE_MAX:
+        # Drop the oldest entry (dicts preserve insertion order)
+        _local_cache.pop(next(iter(_local_cache)))
+    _local_cache[url_key] = (summary, expires_at)
+
+
+def check_cache(url):
+    """Look up a cached summary, first in-process then in DynamoDB"""
+    url_key = _url_key(url)
+
+    # In-process hit: no network round trip at all
+    local = _local_cache.get(url_key)
+    if local:
+        summary, expires_at = local
+        if time.time() < expires_at:
+            return summary
+        del _local_cache[url_key]
+
+    if not _table:
+        return None
+    try:
+        # The table expires entries via DynamoDB TTL on the ttl attribute;
+        # the filter guards against TTL's deletion lag
+        response = _table.get_item(
+            Key={'url_id': url_key},
+            ProjectionExpression='summary, #ttl',
+            ExpressionAttributeNames={'#ttl': 'ttl'},
+            ReturnConsumedCapacity='NONE'
+        )
+        item = response.get('Item')
+        if not item or int(item['ttl']) <= time.time():
+            return None
+
+        _local_cache_put(url_key, item['summary'], int(item['ttl']))
+        return item['summary']
+
+    except Exception as e:
+        print(f"Cache check error: {e}")
+        return None
+
+
+def save_to_cache(url, summary):
+    """Store a summary in-process and in DynamoDB for later requests"""
+    url_key = _url_key(url)
+    expires_at = int(time.time()) + _CACHE_TTL
+    _local_cache_put(url_key, summary, expires_at)
+
+    if not _table:
+        return
+    try:
+        _table.put_item(
+            Item={
+                'url_id': url_key,
+                'url': url,
+                'summary': summary,
+                'ttl': expires_at
+            },
+            ReturnConsumedCapacity='NONE'
+        )
+    except Exception as e:
+        print(f"Cache save error: {e}")
+
+
 # For local testing
 if __name__ == "__main__":
     # Test event
     test_event = {
-        'body': json.dumps({
+        'body': _json_dumps({
             'url': 'https://example.com/article'
         })
     }
     
     result = lambda_handler(test_event, None)
+    # Pretty-printing isn't a hot path; stdlib json keeps indent support
     print("Response:", json.dumps(result, indent=2))